@@ -4,38 +4,120 @@ Chat Engine - Handles interactions with AI language models
 """
 
 import os
-import json
-from typing import List, Dict, Any, Optional
+import sys
+import asyncio
+import hashlib
+import inspect
+import functools
+
+import orjson
+from collections import OrderedDict
+from typing import Iterator, List, Dict, Any, Optional
 from datetime import datetime
 
-from dotenv import load_dotenv
+# tiktoken gives accurate counts via its Rust BPE; fall back to a cheap
+# chars/4 heuristic when it is not installed
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# ml_models loads the .env file once on import
 from ml_models import ModelFactory, BaseModel, ModelResponse
 
-# Load environment variables
-load_dotenv()
+# Maximum number of cached responses kept for identical conversation prefixes
+RESPONSE_CACHE_SIZE = 128
+
+# Interned role strings: every message shares one object per role instead of
+# allocating a fresh string, which matters for heap residency on long chats
+ROLE_SYSTEM = sys.intern("system")
+ROLE_USER = sys.intern("user")
+ROLE_ASSISTANT = sys.intern("assistant")
+
+
+@functools.lru_cache(maxsize=4)
+def _encoding_for(model_name: str):
+    """Get the tiktoken encoding for a model, defaulting to cl100k_base"""
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _approx_tokens(text: str, model_name: str = "gpt-3.5-turbo") -> int:
+    """Estimate the number of tokens in a piece of text
+
+    Used to keep token statistics meaningful for providers that don't
+    report usage. Counts with tiktoken when available; otherwise uses the
+    standard ~4 characters per token heuristic.
+
+    Args:
+        text: The text to count
+        model_name: The model whose tokenizer to prefer
+
+    Returns:
+        The estimated token count
+    """
+    if tiktoken is not None:
+        try:
+            return len(_encoding_for(model_name).encode(text))
+        except Exception:
+            pass
+    return (len(text) + 3) >> 2
+
+
+def _message(role: str, content: str) -> Dict[str, str]:
+    """Build a message dictionary with an interned role string
+
+    Args:
+        role: One of the interned ROLE_* constants
+        content: The message content
+
+    Returns:
+        A message dictionary in the shape the model APIs expect
+    """
+    return {"role": role, "content": content}
 
 
 class ChatEngine:
     """Handles interactions with AI language models"""
     
-    def __init__(self, model: str = "gpt-3.5-turbo", system_message: str = ""):
+    def __init__(self, model: str = "gpt-3.5-turbo", system_message: str = "", max_turns: int = 6):
         """Initialize the chat engine
-        
+
         Args:
             model: The AI model to use
             system_message: The system message to set context
+            max_turns: Maximum number of user/assistant turn pairs sent to the model
         """
         self.model_name = model
         self.system_message = system_message
+        self.max_turns = max_turns
         self.conversation_history = []
         self.token_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+        # Prefix-hash response cache: each entry in _prefix_hashes is the
+        # chained hash of the conversation up to that message, so hashing a
+        # new turn is O(1) instead of re-hashing the whole history
+        self._prefix_hashes = []
+        self._response_cache = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # Append-only autosave state, active after the first explicit save
+        self._autosave_fp = None
+        self._autosave_base = None
+        self._autosaved_count = 0
+
+        # Flattened list of supported model names, built on first use
+        self._flat_models = None
         
         # Initialize the model
         self.model = ModelFactory.create_model(model)
         
         # Add system message if provided
         if system_message:
-            self.conversation_history.append({"role": "system", "content": system_message})
+            self.conversation_history.append(_message(ROLE_SYSTEM, system_message))
     
     def set_model(self, model_name: str) -> None:
         """Change the AI model
@@ -51,11 +133,12 @@ class ChatEngine:
             self.model = ModelFactory.create_model(model_name)
             self.model_name = model_name
         except ValueError as e:
-            # Get supported models
-            supported_models = ModelFactory.get_supported_models()
-            flat_models = [model for provider_models in supported_models.values() for model in provider_models]
-            
-            raise ValueError(f"Model '{model_name}' is not supported. Supported models: {', '.join(flat_models)}")
+            # Flatten the supported models once and reuse on later failures
+            if self._flat_models is None:
+                supported_models = ModelFactory.get_supported_models()
+                self._flat_models = [model for provider_models in supported_models.values() for model in provider_models]
+
+            raise ValueError(f"Model '{model_name}' is not supported. Supported models: {', '.join(self._flat_models)}")
     
     def set_system_message(self, system_message: str) -> None:
         """Set or update the system message
@@ -63,23 +146,147 @@ class ChatEngine:
         Args:
             system_message: The new system message
         """
-        # Remove existing system message if any
-        self.conversation_history = [msg for msg in self.conversation_history if msg["role"] != "system"]
-        
-        # Add new system message
-        if system_message:
-            self.conversation_history.insert(0, {"role": "system", "content": system_message})
-        
+        # The system message is always at index 0 or absent, so this is a
+        # constant-time rewrite rather than an O(N) filter of the history
+        if self.conversation_history and self.conversation_history[0]["role"] == ROLE_SYSTEM:
+            if system_message:
+                self.conversation_history[0] = _message(ROLE_SYSTEM, system_message)
+            else:
+                del self.conversation_history[0]
+        elif system_message:
+            self.conversation_history.insert(0, _message(ROLE_SYSTEM, system_message))
+
         self.system_message = system_message
+
+        # The conversation prefix changed, so the hash chain must be rebuilt
+        self._prefix_hashes = []
     
     def clear_history(self) -> None:
         """Clear the conversation history"""
         self.conversation_history = []
-        
+        self._prefix_hashes = []
+
+        # The session no longer matches the saved file, so stop appending to it
+        self._close_autosave()
+
         # Re-add system message if it exists
         if self.system_message:
-            self.conversation_history.append({"role": "system", "content": self.system_message})
+            self.conversation_history.append(_message(ROLE_SYSTEM, self.system_message))
     
+    def set_max_turns(self, max_turns: int) -> None:
+        """Set the history window size
+
+        Args:
+            max_turns: Maximum number of user/assistant turn pairs sent to the model
+
+        Raises:
+            ValueError: If max_turns is not a positive integer
+        """
+        if max_turns < 1:
+            raise ValueError("Window size must be at least 1 turn")
+        self.max_turns = max_turns
+
+    def _effective_history(self) -> List[Dict[str, str]]:
+        """Get the windowed history that is sent to the model
+
+        The full history is kept in conversation_history for saving and
+        display; only the system message plus the last max_turns pairs of
+        user/assistant messages are sent to the model, which bounds prompt
+        size in long sessions. The window boundary is a message count, so
+        the windowed prefix stays stable (and cacheable) across turns.
+
+        Returns:
+            The windowed conversation history
+        """
+        history = self.conversation_history
+        if history and history[0]["role"] == ROLE_SYSTEM:
+            return [history[0]] + history[1:][-2 * self.max_turns:]
+        return history[-2 * self.max_turns:]
+
+    @staticmethod
+    def _chain_hash(prev_hash: str, message: Dict[str, str]) -> str:
+        """Compute the chained hash of a conversation prefix
+
+        Args:
+            prev_hash: The hash of the preceding prefix ("" for the first message)
+            message: The message to fold into the hash
+
+        Returns:
+            The hex digest identifying the prefix ending at this message
+        """
+        digest = hashlib.blake2b(prev_hash.encode("utf-8"))
+        digest.update(orjson.dumps(message, option=orjson.OPT_SORT_KEYS))
+        return digest.hexdigest()
+
+    def _current_prefix_hash(self) -> str:
+        """Get the hash of the current conversation history
+
+        Extends the cached hash chain to cover any messages appended since the
+        last call, so only new messages are hashed. If the history was rebuilt
+        or truncated externally, the chain is recomputed from scratch.
+
+        Returns:
+            The hex digest of the full conversation history ("" if empty)
+        """
+        if len(self._prefix_hashes) > len(self.conversation_history):
+            self._prefix_hashes = []
+
+        prev_hash = self._prefix_hashes[-1] if self._prefix_hashes else ""
+        for message in self.conversation_history[len(self._prefix_hashes):]:
+            prev_hash = self._chain_hash(prev_hash, message)
+            self._prefix_hashes.append(prev_hash)
+
+        return prev_hash
+
+    def _cache_response(self, prefix_hash: str, response_text: str) -> None:
+        """Store a response in the prefix cache, evicting the oldest entry if full
+
+        Args:
+            prefix_hash: The hash of the conversation prefix that produced the response
+            response_text: The response text to cache
+        """
+        self._response_cache[prefix_hash] = response_text
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    def _update_token_usage(self, usage: Optional[Dict[str, int]], prompt_messages: List[Dict[str, str]], completion_text: str) -> None:
+        """Accumulate token usage, estimating locally when the provider reports none
+
+        Providers like local Ollama backends return no usage metadata, which
+        would leave /tokens stuck at zero and starve the window-trim policy.
+
+        Args:
+            usage: The usage dictionary reported by the provider, if any
+            prompt_messages: The messages that were sent as the prompt
+            completion_text: The generated response text
+        """
+        if not usage or not usage.get("total_tokens"):
+            prompt_tokens = sum(_approx_tokens(m["content"], self.model_name) for m in prompt_messages)
+            completion_tokens = _approx_tokens(completion_text, self.model_name)
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+
+        self.token_usage["prompt_tokens"] += usage["prompt_tokens"]
+        self.token_usage["completion_tokens"] += usage["completion_tokens"]
+        self.token_usage["total_tokens"] += usage["total_tokens"]
+
+    def get_cache_info(self) -> Dict[str, Any]:
+        """Get prefix-cache statistics
+
+        Returns:
+            A dictionary with hit/miss counts, hit ratio, and cache size
+        """
+        total = self._cache_hits + self._cache_misses
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_ratio": self._cache_hits / total if total else 0.0,
+            "size": len(self._response_cache),
+        }
+
     def send_message(self, message: str) -> str:
         """Send a message to the AI model and get a response
         
@@ -92,32 +299,160 @@ class ChatEngine:
         Raises:
             Exception: If there's an error communicating with the API
         """
-        # Add user message to history
-        self.conversation_history.append({"role": "user", "content": message})
-        
+        user_message = _message(ROLE_USER, message)
+
+        # Check the prefix cache: an identical conversation prefix means the
+        # model was already asked this exact question, so reuse the response
+        prefix_hash = self._chain_hash(self._current_prefix_hash(), user_message)
+        cached_response = self._response_cache.get(prefix_hash)
+        if cached_response is not None:
+            self._cache_hits += 1
+            self._response_cache.move_to_end(prefix_hash)
+            self.conversation_history.append(user_message)
+            self.conversation_history.append(_message(ROLE_ASSISTANT, cached_response))
+            self._autosave_messages()
+            return cached_response
+        self._cache_misses += 1
+
+        # Hand the model an immutable tuple of the windowed history plus the
+        # pending user turn; nothing is committed to the shared history until
+        # the call succeeds, so the failure path needs no rollback
+        payload = tuple(self._effective_history()) + (user_message,)
+
         try:
-            # Generate response using the model
-            model_response = self.model.generate_response(self.conversation_history)
-            
-            # Extract the response text
-            ai_message = model_response.text
-            
-            # Update token usage statistics
-            if model_response.usage:
-                self.token_usage["prompt_tokens"] += model_response.usage["prompt_tokens"]
-                self.token_usage["completion_tokens"] += model_response.usage["completion_tokens"]
-                self.token_usage["total_tokens"] += model_response.usage["total_tokens"]
-            
-            # Add AI response to history
-            self.conversation_history.append({"role": "assistant", "content": ai_message})
-            
-            return ai_message
-        
+            model_response = self.model.generate_response(payload)
         except Exception as e:
-            # Remove the user message from history on error
-            self.conversation_history.pop()
             raise Exception(f"Error communicating with AI: {str(e)}")
+
+        # Extract the response text
+        ai_message = model_response.text
+
+        # Update token usage statistics
+        self._update_token_usage(model_response.usage, payload, ai_message)
+
+        # Commit the turn to history and cache the response
+        self.conversation_history.append(user_message)
+        self.conversation_history.append(_message(ROLE_ASSISTANT, ai_message))
+        self._cache_response(prefix_hash, ai_message)
+        self._autosave_messages()
+
+        return ai_message
     
+    def stream_message(self, message: str) -> Iterator[str]:
+        """Send a message and yield the response incrementally
+
+        Chunks are yielded as the model produces them so the interface can
+        render the response as it arrives instead of waiting for the full
+        generation. If the model does not support streaming, the complete
+        response is yielded as a single chunk.
+
+        Args:
+            message: The user message to send
+
+        Yields:
+            Chunks of the AI model's response
+
+        Raises:
+            Exception: If there's an error communicating with the API
+        """
+        stream_fn = getattr(self.model, "generate_response_stream", None)
+        if stream_fn is None:
+            yield self.send_message(message)
+            return
+
+        user_message = _message(ROLE_USER, message)
+
+        # Serve repeated prefixes from the cache without streaming
+        prefix_hash = self._chain_hash(self._current_prefix_hash(), user_message)
+        cached_response = self._response_cache.get(prefix_hash)
+        if cached_response is not None:
+            self._cache_hits += 1
+            self._response_cache.move_to_end(prefix_hash)
+            self.conversation_history.append(user_message)
+            self.conversation_history.append(_message(ROLE_ASSISTANT, cached_response))
+            self._autosave_messages()
+            yield cached_response
+            return
+        self._cache_misses += 1
+
+        # As in send_message, history is only committed after success
+        payload = tuple(self._effective_history()) + (user_message,)
+
+        chunks = []
+        try:
+            for chunk in stream_fn(payload):
+                if chunk:
+                    chunks.append(chunk)
+                    yield chunk
+        except Exception as e:
+            raise Exception(f"Error communicating with AI: {str(e)}")
+
+        # Commit the turn to history and cache the assembled response
+        ai_message = "".join(chunks)
+        self.conversation_history.append(user_message)
+        self.conversation_history.append(_message(ROLE_ASSISTANT, ai_message))
+        self._update_token_usage(None, payload, ai_message)
+        self._cache_response(prefix_hash, ai_message)
+        self._autosave_messages()
+
+    async def send_message_async(self, message: str) -> str:
+        """Send a message without blocking the event loop
+
+        The model call runs in a worker thread so callers can overlap it with
+        other awaitables.
+
+        Args:
+            message: The user message to send
+
+        Returns:
+            The AI model's response
+        """
+        return await asyncio.to_thread(self.send_message, message)
+
+    def send_messages_batch(self, messages: List[str], max_concurrency: int = 4) -> List[Any]:
+        """Send several independent prompts concurrently
+
+        Each prompt is sent against the current conversation context but the
+        prompts do not see each other's responses; the shared history is not
+        modified. Concurrency is bounded to stay under provider rate limits.
+
+        Args:
+            messages: The prompts to send
+            max_concurrency: Maximum number of in-flight requests
+
+        Returns:
+            A list of response strings (or exceptions) in prompt order
+        """
+        context = self._effective_history()
+
+        # Batch prompts are independent, so never route them through a
+        # model's persistent chat session: concurrent sends would race on
+        # it and contaminate each other's context
+        try:
+            stateless = "session_id" in inspect.signature(self.model.generate_response).parameters
+        except (TypeError, ValueError):
+            stateless = False
+
+        def generate(message: str) -> str:
+            payload = context + [_message(ROLE_USER, message)]
+            if stateless:
+                return self.model.generate_response(payload, session_id=None).text
+            return self.model.generate_response(payload).text
+
+        async def run() -> List[Any]:
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def generate_bounded(message: str) -> str:
+                async with semaphore:
+                    return await asyncio.to_thread(generate, message)
+
+            return await asyncio.gather(
+                *(generate_bounded(message) for message in messages),
+                return_exceptions=True,
+            )
+
+        return asyncio.run(run())
+
     def get_conversation_history(self) -> List[Dict[str, str]]:
         """Get the conversation history
         
@@ -134,21 +469,68 @@ class ChatEngine:
         """
         return self.token_usage
     
-    def save_conversation(self, filename: str) -> None:
-        """Save the conversation history to a file
-        
+    def save_conversation(self, filename: str) -> str:
+        """Save the conversation history to disk
+
+        The conversation is stored as two files: a small `.meta.json` header
+        with the session metadata (rewritten on each save) and a `.jsonl`
+        message log with one message per line. After the first save, the log
+        stays open in append mode and each completed turn is appended, so
+        per-turn saves are O(1) instead of rewriting the whole conversation.
+
         Args:
-            filename: The name of the file to save to
+            filename: The name of the file to save to (any .json/.jsonl
+                extension is stripped to form the base name)
+
+        Returns:
+            The path to the message log file
         """
-        # Create a dictionary with metadata and conversation
-        data = {
+        base = filename
+        for suffix in (".jsonl", ".json"):
+            if base.endswith(suffix):
+                base = base[:-len(suffix)]
+                break
+
+        self._close_autosave()
+
+        # Write the full message log, then keep it open for appends
+        with open(base + ".jsonl", "wb") as f:
+            for message in self.conversation_history:
+                f.write(orjson.dumps(message) + b"\n")
+
+        self._autosave_base = base
+        self._autosaved_count = len(self.conversation_history)
+        self._autosave_fp = open(base + ".jsonl", "ab")
+        self._write_meta()
+
+        return base + ".jsonl"
+
+    def _write_meta(self) -> None:
+        """Write the metadata header for the current autosave target"""
+        meta = {
             "timestamp": datetime.now().isoformat(),
             "model": self.model_name,
             "provider": self.model.provider,
             "token_usage": self.token_usage,
-            "conversation": self.conversation_history
         }
-        
-        # Save to file
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+        with open(self._autosave_base + ".meta.json", "wb") as f:
+            f.write(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+
+    def _autosave_messages(self) -> None:
+        """Append any messages not yet on disk to the autosave log"""
+        if self._autosave_fp is None:
+            return
+
+        for message in self.conversation_history[self._autosaved_count:]:
+            self._autosave_fp.write(orjson.dumps(message) + b"\n")
+        self._autosave_fp.flush()
+        self._autosaved_count = len(self.conversation_history)
+        self._write_meta()
+
+    def _close_autosave(self) -> None:
+        """Stop autosaving and close the message log if it is open"""
+        if self._autosave_fp is not None:
+            self._autosave_fp.close()
+            self._autosave_fp = None
+        self._autosave_base = None
+        self._autosaved_count = 0
\ No newline at end of file
@@ -3,37 +3,26 @@
 CLI Chat Tool - A command-line interface for chatting with AI language models
 """
 
-import os
+from __future__ import annotations
+
 import sys
-import json
 from typing import List, Dict, Any, Optional
 
 import typer
-from rich.console import Console
-from rich.markdown import Markdown
-from dotenv import load_dotenv
 
-# Import our modules
-from chat_engine import ChatEngine
+# Import our modules (the heavy ones are imported lazily inside chat() so
+# `--help` and startup don't pay for rich and the model SDKs)
 from config import Config
-from cli_interface import CLIInterface
-from conversation import ConversationManager
-from ml_models import ModelFactory
 
 # Initialize typer app
 app = typer.Typer(help="CLI Chat Tool - Chat with AI language models from your terminal")
 
-# Load environment variables
-load_dotenv()
-
-# Initialize configuration
+# Initialize configuration (config.py loads the .env file once on import)
 config = Config()
 
-# Initialize console
-console = Console()
-
-# Initialize CLI interface
-cli = CLIInterface()
+# Console and CLI interface, created when the chat session starts
+console = None
+cli = None
 
 
 @app.command()
@@ -47,24 +36,33 @@ def chat(
     ),
 ):
     """Start an interactive chat session with an AI language model"""
+    global console, cli
+
+    # Deferred imports: rich and the model SDKs dominate startup time
+    from rich.console import Console
+    from chat_engine import ChatEngine
+    from cli_interface import CLIInterface
+    from conversation import ConversationManager
+
+    console = Console()
+    cli = CLIInterface()
+
     # Display welcome message
     cli.display_welcome()
-    
+
     # Initialize chat engine with the specified model
     chat_engine = ChatEngine(model=model, system_message=system_message)
     
     # Initialize conversation manager
     conversation_manager = ConversationManager(chat_engine, console)
     
-    # Load conversation if specified
+    # Load conversation if specified (a missing file surfaces through the
+    # load failure path, so no pre-flight existence check is needed)
     if load_conversation:
-        if os.path.exists(load_conversation):
-            if conversation_manager.load_conversation(load_conversation):
-                cli.display_info(f"Loaded conversation from {load_conversation}")
-            else:
-                cli.display_error(f"Failed to load conversation from {load_conversation}")
+        if conversation_manager.load_conversation(load_conversation):
+            cli.display_info(f"Loaded conversation from {load_conversation}")
         else:
-            cli.display_error(f"File not found: {load_conversation}")
+            cli.display_error(f"Failed to load conversation from {load_conversation}")
     
     # Register command handlers
     cli.register_command("/clear", lambda _: (chat_engine.clear_history(), cli.display_info("Conversation history cleared")))
@@ -73,6 +71,9 @@ def chat(
     cli.register_command("/model", lambda args: change_model(chat_engine, args))
     cli.register_command("/system", lambda args: (chat_engine.set_system_message(args), cli.display_info("System message updated")))
     cli.register_command("/tokens", lambda _: display_token_usage(chat_engine))
+    cli.register_command("/cacheinfo", lambda _: display_cache_info(chat_engine))
+    cli.register_command("/window", lambda args: change_window(chat_engine, args))
+    cli.register_command("/batch", lambda args: run_batch(chat_engine, args))
     cli.register_command("/history", lambda _: display_history(chat_engine))
     cli.register_command("/models", lambda _: list_available_models())
     
@@ -89,12 +90,8 @@ def chat(
         
         # Process regular message
         try:
-            # Show thinking indicator
-            with cli.display_thinking():
-                response = chat_engine.send_message(user_input)
-            
-            # Display the response
-            cli.display_ai_response(response)
+            # Stream the response so tokens render as they arrive
+            cli.display_ai_response_stream(chat_engine.stream_message(user_input))
         except Exception as e:
             cli.display_error(str(e))
 
@@ -147,6 +144,8 @@ def change_model(chat_engine: ChatEngine, model_name: str) -> None:
 def list_available_models() -> None:
     """List all available models"""
     try:
+        from ml_models import ModelFactory
+
         supported_models = ModelFactory.get_supported_models()
         
         cli.console.print("[bold blue]Available Models:[/bold blue]")
@@ -172,9 +171,102 @@ def display_token_usage(chat_engine: ChatEngine) -> None:
     cli.console.print(f"Total tokens: {usage['total_tokens']}")
 
 
+def run_batch(chat_engine: ChatEngine, filename: str) -> None:
+    """Send each line of a file as an independent prompt
+
+    Args:
+        chat_engine: The chat engine instance
+        filename: The file containing one prompt per line
+    """
+    if not filename:
+        cli.display_error("Usage: /batch <file>")
+        return
+
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            prompts = [line.strip() for line in f if line.strip()]
+    except OSError as e:
+        cli.display_error(f"Could not read {filename}: {str(e)}")
+        return
+
+    if not prompts:
+        cli.display_info("No prompts found in file")
+        return
+
+    with cli.display_thinking():
+        results = chat_engine.send_messages_batch(prompts)
+
+    for prompt, result in zip(prompts, results):
+        cli.console.print(f"\n[bold green]Prompt:[/bold green] {prompt}")
+        if isinstance(result, Exception):
+            cli.display_error(str(result))
+        else:
+            cli.display_ai_response(result)
+
+
+def change_window(chat_engine: ChatEngine, args: str) -> None:
+    """Change the history window size
+
+    Args:
+        chat_engine: The chat engine instance
+        args: The new window size in turns
+    """
+    try:
+        chat_engine.set_max_turns(int(args))
+        cli.display_info(f"History window set to {chat_engine.max_turns} turns")
+    except ValueError as e:
+        cli.display_error(str(e) if args.strip().isdigit() else f"Invalid window size: {args}")
+
+
+def display_cache_info(chat_engine: ChatEngine) -> None:
+    """Display response cache statistics
+
+    Args:
+        chat_engine: The chat engine instance
+    """
+    info = chat_engine.get_cache_info()
+
+    cli.console.print("[bold blue]Response Cache:[/bold blue]")
+    cli.console.print(f"Hits: {info['hits']}")
+    cli.console.print(f"Misses: {info['misses']}")
+    cli.console.print(f"Hit ratio: {info['hit_ratio']:.1%}")
+    cli.console.print(f"Cached responses: {info['size']}")
+
+
+# History dumps longer than this skip rich and emit raw ANSI in one write
+HISTORY_FAST_PATH_THRESHOLD = 50
+
+# ANSI color prefix per role for the fast path
+_ROLE_COLORS = {
+    "system": b"\x1b[1;33mSystem:\x1b[0m ",
+    "user": b"\x1b[1;32mYou:\x1b[0m ",
+    "assistant": b"\x1b[1;34mAI:\x1b[0m ",
+}
+
+
+def display_history_fast(history: List[Dict[str, str]]) -> None:
+    """Dump a long history as pre-formatted ANSI text in one buffered write
+
+    Bypasses rich's layout engine entirely: for hundreds of messages the
+    Markdown/segment work dominates, and a plain byte buffer pushed through
+    stdout in one go is far cheaper. The buffered stream handles partial
+    writes, which a bare os.write would not for large dumps.
+
+    Args:
+        history: The conversation history to display
+    """
+    parts = [b"\x1b[1;34mConversation History:\x1b[0m\n"]
+    for message in history:
+        prefix = _ROLE_COLORS.get(message["role"])
+        if prefix is not None:
+            parts.append(b"\n" + prefix + message["content"].encode("utf-8", "replace") + b"\n")
+    sys.stdout.buffer.write(b"".join(parts))
+    sys.stdout.buffer.flush()
+
+
 def display_history(chat_engine: ChatEngine) -> None:
     """Display conversation history
-    
+
     Args:
         chat_engine: The chat engine instance
     """
@@ -182,15 +274,30 @@ def display_history(chat_engine: ChatEngine) -> None:
     if not history:
         cli.display_info("No conversation history")
         return
-    
-    cli.console.print("[bold blue]Conversation History:[/bold blue]")
+
+    # Raw ANSI is only safe on a real terminal; piped or captured output
+    # falls through to the rich path, which strips styling itself
+    if len(history) > HISTORY_FAST_PATH_THRESHOLD and cli.console.is_terminal:
+        display_history_fast(history)
+        return
+
+    from rich.console import Group
+    from rich.text import Text
+
+    # Collect everything into one Group so the whole history is laid out
+    # and written in a single print instead of one syscall per message
+    renderables = [Text.from_markup("[bold blue]Conversation History:[/bold blue]")]
     for message in history:
         if message["role"] == "system":
-            cli.console.print(f"\n[bold yellow]System:[/bold yellow] {message['content']}")
+            renderables.append(Text.from_markup(f"\n[bold yellow]System:[/bold yellow] {message['content']}"))
         elif message["role"] == "user":
-            cli.console.print(f"\n[bold green]You:[/bold green] {message['content']}")
+            renderables.append(Text.from_markup(f"\n[bold green]You:[/bold green] {message['content']}"))
         elif message["role"] == "assistant":
-            cli.console.print(f"\n[bold blue]AI:[/bold blue] {message['content']}")
+            # Markdown parsing is the expensive part; reuse cached renderables
+            renderables.append(Text.from_markup("\n[bold blue]AI:[/bold blue]"))
+            renderables.append(cli.markdown_for(message["content"]))
+
+    cli.console.print(Group(*renderables))
 
 
 if __name__ == "__main__":
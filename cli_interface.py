@@ -7,14 +7,12 @@ import os
 import sys
 from typing import List, Dict, Any, Optional, Callable
 
+# Table, Progress, and Live are imported lazily in the methods that use
+# them to keep startup fast
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
-from rich.syntax import Syntax
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.live import Live
 
 # Initialize console for rich text formatting
 console = Console()
@@ -26,6 +24,26 @@ class CLIInterface:
     def __init__(self):
         """Initialize the CLI interface"""
         self.console = Console()
+        # Parsed Markdown renderables keyed by message content hash, so
+        # repeated /history invocations don't re-lex the same messages
+        self._md_cache = {}
+
+        # The welcome panel and help table are immutable, so build them once
+        # and reuse the renderables on every display call
+        self._welcome_panel = Panel.fit(
+            "[bold blue]CLI Chat Tool[/bold blue]\n"
+            "Chat with AI language models directly from your terminal.\n"
+            "Type [bold green]/help[/bold green] to see available commands.",
+            title="Welcome",
+            border_style="blue"
+        )
+        self._help_table = self._build_help_table()
+
+        # Reusable thinking spinner, built on first use so the hot chat
+        # loop doesn't re-instantiate rich widgets every turn
+        self._spinner_progress = None
+        self._spinner_task = None
+        self._spinner_live = None
         self.commands = {
             "/help": self.display_help,
             "/exit": self.exit_app,
@@ -37,6 +55,9 @@ class CLIInterface:
             "/models": None,  # Will be set by the main app
             "/system": None,  # Will be set by the main app
             "/tokens": None,  # Will be set by the main app
+            "/cacheinfo": None,  # Will be set by the main app
+            "/window": None,  # Will be set by the main app
+            "/batch": None,  # Will be set by the main app
             "/history": None,  # Will be set by the main app
         }
     
@@ -50,22 +71,19 @@ class CLIInterface:
         if command in self.commands:
             self.commands[command] = handler
     
-    def display_welcome(self) -> None:
-        """Display welcome message and instructions"""
-        self.console.print(Panel.fit(
-            "[bold blue]CLI Chat Tool[/bold blue]\n"
-            "Chat with AI language models directly from your terminal.\n"
-            "Type [bold green]/help[/bold green] to see available commands.",
-            title="Welcome",
-            border_style="blue"
-        ))
-    
-    def display_help(self, *args) -> None:
-        """Display help information"""
+    @staticmethod
+    def _build_help_table():
+        """Build the table of available commands
+
+        Returns:
+            The populated help table
+        """
+        from rich.table import Table
+
         help_table = Table(title="Available Commands")
         help_table.add_column("Command", style="green")
         help_table.add_column("Description")
-        
+
         help_table.add_row("/help", "Show this help message")
         help_table.add_row("/exit or /quit", "Exit the application")
         help_table.add_row("/clear", "Clear the conversation history")
@@ -75,9 +93,20 @@ class CLIInterface:
         help_table.add_row("/models", "List available AI models")
         help_table.add_row("/system <message>", "Set a system message")
         help_table.add_row("/tokens", "Show token usage statistics")
+        help_table.add_row("/cacheinfo", "Show response cache statistics")
+        help_table.add_row("/window <N>", "Set the history window size in turns")
+        help_table.add_row("/batch <file>", "Send each line of a file as a prompt concurrently")
         help_table.add_row("/history", "Show conversation history")
-        
-        self.console.print(help_table)
+
+        return help_table
+
+    def display_welcome(self) -> None:
+        """Display welcome message and instructions"""
+        self.console.print(self._welcome_panel)
+
+    def display_help(self, *args) -> None:
+        """Display help information"""
+        self.console.print(self._help_table)
     
     def exit_app(self, *args) -> bool:
         """Exit the application
@@ -90,21 +119,55 @@ class CLIInterface:
     
     def get_user_input(self) -> str:
         """Get input from the user
-        
+
         Returns:
             The user's input
         """
         return Prompt.ask("\n[bold green]You[/bold green]")
     
+    def markdown_for(self, content: str) -> Markdown:
+        """Get a Markdown renderable for a message, reusing parsed ones
+
+        Args:
+            content: The message content to render
+
+        Returns:
+            A cached (or newly parsed) Markdown renderable
+        """
+        key = hash(content)
+        md = self._md_cache.get(key)
+        if md is None:
+            md = self._md_cache[key] = Markdown(content)
+        return md
+
     def display_ai_response(self, response: str) -> None:
         """Display the AI's response
-        
+
         Args:
             response: The AI's response text
         """
         self.console.print("\n[bold blue]AI[/bold blue]")
-        self.console.print(Markdown(response))
+        self.console.print(self.markdown_for(response))
     
+    def display_ai_response_stream(self, chunks) -> str:
+        """Display the AI's response as it streams in
+
+        Args:
+            chunks: An iterator of response text chunks
+
+        Returns:
+            The complete response text
+        """
+        from rich.live import Live
+
+        self.console.print("\n[bold blue]AI[/bold blue]")
+        buffer = ""
+        with Live(Markdown(""), console=self.console, refresh_per_second=15) as live:
+            for chunk in chunks:
+                buffer += chunk
+                live.update(Markdown(buffer))
+        return buffer
+
     def display_error(self, error_message: str) -> None:
         """Display an error message
         
@@ -121,24 +184,32 @@ class CLIInterface:
         """
         self.console.print(f"[bold yellow]{message}[/bold yellow]")
     
-    def display_thinking(self, message: str = "Thinking") -> Live:
+    def display_thinking(self, message: str = "Thinking"):
         """Display a thinking/loading indicator
-        
+
         Args:
             message: The message to display while thinking
-            
+
         Returns:
             A Live context manager for the progress indicator
         """
-        progress = Progress(
-            SpinnerColumn(),
-            TextColumn(f"[bold blue]{message}...[/bold blue]"),
-            transient=True
-        )
-        live = Live(progress, refresh_per_second=10)
-        live.start()
-        progress.add_task("thinking", total=None)
-        return live
+        if self._spinner_progress is None:
+            from rich.live import Live
+            from rich.progress import Progress, SpinnerColumn, TextColumn
+
+            self._spinner_progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[bold blue]{task.description}...[/bold blue]"),
+                transient=True,
+                console=self.console
+            )
+            self._spinner_task = self._spinner_progress.add_task(message, total=None)
+            self._spinner_live = Live(self._spinner_progress, console=self.console, refresh_per_second=10, transient=True)
+        else:
+            self._spinner_progress.update(self._spinner_task, description=message)
+
+        self._spinner_live.start()
+        return self._spinner_live
     
     def process_command(self, user_input: str) -> bool:
         """Process a command from the user
@@ -149,18 +220,24 @@ class CLIInterface:
         Returns:
             True if the app should exit, False otherwise
         """
-        if not user_input.startswith("/"):
-            return False
-        
-        # Split the input into command and arguments
+        # Split the input into command and arguments (the caller already
+        # gates on the leading "/")
         parts = user_input.split(maxsplit=1)
-        command = parts[0].lower()
+        if not parts:
+            return False
+
+        # Registered commands are all lowercase, so only allocate a
+        # lowered copy when the input actually contains uppercase
+        command = parts[0]
+        if not command.islower():
+            command = command.lower()
         args = parts[1] if len(parts) > 1 else ""
-        
-        # Check if the command is registered
-        if command in self.commands and self.commands[command] is not None:
-            result = self.commands[command](args)
+
+        # Single dict lookup instead of membership test plus indexing
+        handler = self.commands.get(command)
+        if handler is not None:
+            result = handler(args)
             return result if result is not None else False
-        else:
-            self.display_error(f"Unknown command: {command}")
-            return False
\ No newline at end of file
+
+        self.display_error(f"Unknown command: {command}")
+        return False
\ No newline at end of file
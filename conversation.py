@@ -4,8 +4,11 @@ Conversation Manager - Handles conversation history and user interaction
 """
 
 import os
-import json
+import mmap
+import time
 from typing import List, Dict, Any, Optional, Tuple
+
+import orjson
 from datetime import datetime
 
 from rich.console import Console
@@ -29,7 +32,11 @@ class ConversationManager:
         self.chat_engine = chat_engine
         self.console = console
         self.conversation_dir = "conversations"
-        
+
+        # Cached directory listing with its expiry time
+        self._listing = None
+        self._listing_expires = 0.0
+
         # Create conversations directory if it doesn't exist
         os.makedirs(self.conversation_dir, exist_ok=True)
     
@@ -45,19 +52,13 @@ class ConversationManager:
         if not filename:
             # Generate a filename based on the current date and time
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"conversation_{timestamp}.json"
-        
-        # Ensure the filename has a .json extension
-        if not filename.endswith(".json"):
-            filename += ".json"
-        
+            filename = f"conversation_{timestamp}"
+
         # Create the full path
         filepath = os.path.join(self.conversation_dir, filename)
-        
-        # Save the conversation
-        self.chat_engine.save_conversation(filepath)
-        
-        return filepath
+
+        # Save the conversation (written as a .meta.json/.jsonl pair)
+        return self.chat_engine.save_conversation(filepath)
     
     def load_conversation(self, filepath: str) -> bool:
         """Load a conversation from a file
@@ -69,44 +70,121 @@ class ConversationManager:
             True if the conversation was loaded successfully, False otherwise
         """
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
+            if filepath.endswith(".jsonl"):
+                # New format: metadata sidecar plus streamed message log,
+                # so memory stays bounded regardless of conversation size
+                data = self._load_metadata(filepath[:-len(".jsonl")] + ".meta.json")
+                messages = self._iter_message_log(filepath)
+            else:
+                # Legacy format: single JSON document
+                data = self._load_json_file(filepath)
+                messages = data["conversation"]
+
             # Clear current conversation history
             self.chat_engine.clear_history()
-            
+
             # Set the model
             if "model" in data:
                 self.chat_engine.set_model(data["model"])
-            
+
             # Load the conversation history
-            for message in data["conversation"]:
+            for message in messages:
                 self.chat_engine.conversation_history.append(message)
-            
+
             # Load token usage if available
             if "token_usage" in data:
                 self.chat_engine.token_usage = data["token_usage"]
-            
+
             return True
-        
+
         except Exception as e:
             self.console.print(f"[bold red]Error loading conversation: {str(e)}[/bold red]")
             return False
+
+    @staticmethod
+    def _load_json_file(filepath: str) -> Dict[str, Any]:
+        """Parse a JSON file without copying its bytes into Python first
+
+        The file is memory-mapped and parsed in place, so peak memory is
+        the parsed objects rather than file bytes plus parsed objects.
+
+        Args:
+            filepath: The path to the JSON file
+
+        Returns:
+            The parsed document
+        """
+        with open(filepath, "rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return orjson.loads(memoryview(mm))
+            except ValueError:
+                # Empty files can't be mapped; fall back to a plain read
+                return orjson.loads(f.read())
+
+    @staticmethod
+    def _load_metadata(filepath: str) -> Dict[str, Any]:
+        """Load a conversation metadata sidecar
+
+        Args:
+            filepath: The path to the .meta.json file
+
+        Returns:
+            The metadata dictionary (empty if the sidecar is missing)
+        """
+        try:
+            with open(filepath, "rb") as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def _iter_message_log(filepath: str):
+        """Stream messages from a .jsonl message log one at a time
+
+        Args:
+            filepath: The path to the .jsonl file
+
+        Yields:
+            Message dictionaries in conversation order
+        """
+        with open(filepath, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield orjson.loads(line)
     
     def list_conversations(self) -> List[str]:
-        """List all saved conversations
-        
+        """List all saved conversations, newest first
+
+        Sorting uses the file modification time from a single scandir pass,
+        so custom filenames still sort correctly. The listing is cached for
+        one second to avoid re-scanning the directory on repeated /load
+        invocations.
+
         Returns:
             A list of conversation filenames
         """
-        if not os.path.exists(self.conversation_dir):
+        now = time.monotonic()
+        if self._listing is not None and now < self._listing_expires:
+            return self._listing
+
+        try:
+            with os.scandir(self.conversation_dir) as it:
+                # Conversation files only (skip metadata sidecars)
+                entries = [
+                    e for e in it
+                    if (e.name.endswith(".json") or e.name.endswith(".jsonl"))
+                    and not e.name.endswith(".meta.json") and e.is_file()
+                ]
+        except FileNotFoundError:
             return []
-        
-        # Get all JSON files in the conversations directory
-        files = [f for f in os.listdir(self.conversation_dir) if f.endswith(".json")]
-        files.sort(reverse=True)  # Sort by newest first
-        
-        return files
+
+        entries.sort(key=lambda e: e.stat().st_mtime_ns, reverse=True)
+
+        self._listing = [e.name for e in entries]
+        self._listing_expires = now + 1.0
+        return self._listing
     
     def display_conversation_info(self, filepath: str) -> None:
         """Display information about a conversation
@@ -115,14 +193,17 @@ class ConversationManager:
             filepath: The path to the conversation file
         """
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
+            if filepath.endswith(".jsonl"):
+                data = self._load_metadata(filepath[:-len(".jsonl")] + ".meta.json")
+                message_count = sum(1 for _ in self._iter_message_log(filepath))
+            else:
+                data = self._load_json_file(filepath)
+                message_count = len(data.get("conversation", []))
+
             # Extract metadata
             timestamp = data.get("timestamp", "Unknown")
             model = data.get("model", "Unknown")
             provider = data.get("provider", "Unknown")
-            message_count = len(data.get("conversation", []))
             token_usage = data.get("token_usage", {"total_tokens": 0})["total_tokens"]
             
             # Format the timestamp
@@ -4,54 +4,656 @@ Machine Learning Models - Handles integration with various AI language models
 """
 
 import os
-from typing import List, Dict, Any, Optional, Union
+import json
+import time
+import types
+import asyncio
+import hashlib
+import sqlite3
+import itertools
+import functools
+import threading
+from collections import OrderedDict
+from typing import Iterator, List, Dict, Any, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 
-from openai import OpenAI
+import httpx
+from openai import OpenAI, RateLimitError, AuthenticationError, APIError
+from google.api_core import exceptions as google_exceptions
 import google.generativeai as genai
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Get API keys
-openai_api_key = os.getenv("OPENAI_API_KEY", "sk-placeholder")
-gemini_api_key = os.getenv("GEMINI_API_KEY")
+# Key names that mean "no real key configured" — API calls are mocked
+_PLACEHOLDER_KEYS = ("sk-placeholder", "your_openai_api_key_here")
 
-# Initialize Gemini
-if gemini_api_key:
-    genai.configure(api_key=gemini_api_key)
 
-# Only create the OpenAI client if we need it (lazy initialization)
-client = None
+@functools.lru_cache(maxsize=1)
+def _load_env_once() -> None:
+    """Parse the .env file exactly once per process
+
+    Only the load_dotenv side effect is cached; the keys themselves are
+    read from the environment on every access so patch.dict and mid-
+    process key rotation take effect.
+    """
+    load_dotenv()
+
+
+def _openai_key() -> str:
+    """Get the OpenAI API key, loading the .env file on first use
+
+    Deferring load_dotenv past import keeps module import (and test
+    collection) free of file I/O.
+
+    Returns:
+        The configured key, or a placeholder that triggers mock responses
+    """
+    _load_env_once()
+    return os.getenv("OPENAI_API_KEY", "sk-placeholder")
+
+
+def _gemini_key() -> Optional[str]:
+    """Get the Gemini API key, loading the .env file on first use
+
+    Returns:
+        The configured key, or None when unset
+    """
+    _load_env_once()
+    return os.getenv("GEMINI_API_KEY")
+
+
+# Whether genai.configure has run; repeated imports and constructions
+# must not re-configure the SDK
+_genai_configured = False
+
+
+def _configure_gemini_once() -> None:
+    """Configure the Gemini SDK with the API key exactly once"""
+    global _genai_configured
+    if not _genai_configured and _gemini_key():
+        genai.configure(api_key=_gemini_key())
+        _genai_configured = True
+
+
+# Supported model names per provider; module-level frozensets make each
+# constructor's membership check an O(1) hash lookup with no per-instance
+# list allocation. The joined forms are precomputed for error messages.
+_OPENAI_MODELS = frozenset({"gpt-3.5-turbo", "gpt-4", "gpt-4-turbo"})
+_GEMINI_MODELS = frozenset({"gemini-pro", "gemini-pro-vision", "gemini-1.5-flash"})
+_OPENAI_MODELS_TEXT = ", ".join(sorted(_OPENAI_MODELS))
+_GEMINI_MODELS_TEXT = ", ".join(sorted(_GEMINI_MODELS))
+
+# Shared HTTP connection pool: every OpenAI client reuses these keep-alive
+# connections, so DNS/TCP/TLS setup is paid once rather than per request
+_http_client = httpx.Client(
+    limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=300)
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _async_http_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP connection pool, built on first use
+
+    The async OpenAI clients must receive this explicitly: letting the
+    SDK build its own default client passes constructor arguments that
+    newer httpx releases no longer accept.
+
+    Returns:
+        The process-wide httpx.AsyncClient
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=300)
+    )
+
+
+def _prewarm_connections() -> None:
+    """Open HTTPS connections to the model endpoints ahead of the first call
+
+    Forces DNS resolution and the TLS handshake in the background so the
+    first user-visible request only pays for the model itself.
+    """
+    for url in ("https://api.openai.com", "https://generativelanguage.googleapis.com"):
+        try:
+            _http_client.head(url, timeout=5)
+        except Exception:
+            pass
+
+
+# Whether the background pre-warm thread has been started
+_prewarm_started = False
+
+
+def _maybe_prewarm() -> None:
+    """Start the connection pre-warm thread once a model is constructed
+
+    Only runs when a real key is configured; otherwise calls are mocked
+    and there is nothing worth warming.
+    """
+    global _prewarm_started
+    if _prewarm_started:
+        return
+    _prewarm_started = True
+    if _gemini_key() or _openai_key() not in _PLACEHOLDER_KEYS:
+        threading.Thread(target=_prewarm_connections, daemon=True).start()
+
+
+class _ClientPool:
+    """Round-robin pool of OpenAI clients, one per configured API key
+
+    Set OPENAI_API_KEYS to a comma-separated list to spread requests over
+    several keys; aggregate rate limits then scale with the number of keys
+    without any change to callers. Keys that hit a 429 are put on cooldown
+    and skipped until it expires. Clients are created lazily and all share
+    the pooled HTTP connections.
+    """
+
+    def __init__(self, keys: List[str]):
+        """Initialize the pool
+
+        Args:
+            keys: The API keys to cycle through
+        """
+        self._keys = keys
+        self._clients: Dict[int, Any] = {}
+        self._cycle = itertools.cycle(range(len(keys)))
+        self._cooldown_until = [0.0] * len(keys)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Tuple[int, Any]:
+        """Get the next available client in round-robin order
+
+        Returns:
+            A (key index, client) pair; the index is used to report 429s
+        """
+        with self._lock:
+            now = time.monotonic()
+            # Take the next key that isn't cooling down; if all are, fall
+            # through with the last one rather than failing outright
+            for _ in range(len(self._keys)):
+                index = next(self._cycle)
+                if self._cooldown_until[index] <= now:
+                    break
+            pooled = self._clients.get(index)
+            if pooled is None:
+                pooled = self._clients[index] = OpenAI(api_key=self._keys[index], http_client=_http_client)
+            return index, pooled
+
+    def cool_down(self, index: int, seconds: float = 60.0) -> None:
+        """Skip a key for a while after it was rate limited
+
+        Args:
+            index: The key index returned by acquire
+            seconds: How long to keep the key out of rotation
+        """
+        with self._lock:
+            self._cooldown_until[index] = time.monotonic() + seconds
+
+
+# The current pool and the key tuple it was built from; rebuilt whenever
+# the configured keys change (patched environment, key rotation)
+_pool: Optional[_ClientPool] = None
+_pool_keys: Optional[Tuple[str, ...]] = None
+_pool_lock = threading.Lock()
+
+
+def _client_pool() -> _ClientPool:
+    """Get the shared round-robin client pool, built on first use
+
+    The configured keys are re-read on every call and the pool is rebuilt
+    if they changed. With a single key this degenerates to one lazily
+    created client.
+
+    Returns:
+        The process-wide _ClientPool
+    """
+    global _pool, _pool_keys
+    key = _openai_key()
+    keys = tuple(
+        k.strip() for k in os.getenv("OPENAI_API_KEYS", key).split(",") if k.strip()
+    ) or (key,)
+    with _pool_lock:
+        if _pool is None or keys != _pool_keys:
+            _pool = _ClientPool(list(keys))
+            _pool_keys = keys
+        return _pool
+
+
+class LLMCache:
+    """Exact-match response cache keyed by a hash of the canonical request
+
+    Identical (provider, model, messages) requests are served from memory
+    instead of hitting the API again — a dict lookup instead of a network
+    round-trip, and zero tokens billed on repeats. Entries expire after a
+    TTL and the least recently used entry is evicted when full.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0):
+        """Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl: Entry lifetime in seconds
+        """
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response
+
+        Args:
+            key: The request hash
+
+        Returns:
+            The cached response data, or None on miss/expiry
+        """
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() > entry[0]:
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response, evicting the oldest entry if full
+
+        Args:
+            key: The request hash
+            response: The response data to cache
+        """
+        self._entries[key] = (time.monotonic() + self._ttl, response)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class SemanticCache:
+    """Embedding-similarity response cache for paraphrased prompts
+
+    Where LLMCache only matches byte-identical requests, this cache embeds
+    the last user message and returns a stored response when the cosine
+    similarity against a prior prompt exceeds the threshold — so "What is
+    France's capital?" can reuse the answer for "Tell me France's capital".
+    Lookup is a single matrix-vector product over L2-normalized embeddings.
+
+    Requires sentence-transformers and numpy; silently disables itself if
+    either is missing.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 1024):
+        """Initialize the cache
+
+        Args:
+            threshold: Minimum cosine similarity counted as a hit
+            max_entries: Maximum number of stored (embedding, response) pairs
+        """
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._embedder = None
+        self._embedder_failed = False
+        self._embeddings = None
+        self._responses = []
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _embed(self, text: str):
+        """Embed a prompt, returning None if the embedder is unavailable"""
+        if self._embedder_failed:
+            return None
+        if self._embedder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._embedder = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+            except Exception:
+                self._embedder_failed = True
+                return None
+        import numpy as np
+        return self._embedder.encode([text], normalize_embeddings=True)[0].astype(np.float32)
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        """Look up the response for the most similar cached prompt
+
+        Args:
+            text: The prompt to look up
+
+        Returns:
+            The cached response data, or None if nothing is similar enough
+        """
+        if self._embeddings is None:
+            self.stats["misses"] += 1
+            return None
+
+        query = self._embed(text)
+        if query is None:
+            return None
+
+        # Rows are L2-normalized, so one gemv gives all cosine similarities
+        sims = self._embeddings @ query
+        best = int(sims.argmax())
+        if sims[best] >= self._threshold:
+            self.stats["hits"] += 1
+            return self._responses[best]
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, text: str, response: Dict[str, Any]) -> None:
+        """Store a prompt embedding and its response
+
+        Args:
+            text: The prompt that produced the response
+            response: The response data to cache
+        """
+        vector = self._embed(text)
+        if vector is None:
+            return
+
+        import numpy as np
+        if self._embeddings is None:
+            self._embeddings = vector.reshape(1, -1)
+        else:
+            self._embeddings = np.vstack([self._embeddings, vector])
+        self._responses.append(response)
+
+        # Drop the oldest entries when over capacity
+        if len(self._responses) > self._max_entries:
+            self._embeddings = self._embeddings[1:]
+            self._responses.pop(0)
+
+
+class DiskCache:
+    """SQLite-backed response cache that survives process restarts
+
+    Layered under the in-memory LLMCache: rerunning a script or test
+    session replays yesterday's responses from disk instead of paying the
+    API again. WAL journaling with synchronous=NORMAL keeps writes off
+    the request's critical path as far as SQLite allows.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 86400.0):
+        """Open (or create) the cache database
+
+        Args:
+            path: The database file (defaults to ~/.cache/cli_chat)
+            ttl: Entry lifetime in seconds
+        """
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".cache", "cli_chat", "llm_cache.sqlite")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, text BLOB, usage BLOB, created_at REAL)"
+        )
+        # Expired entries are swept once at open rather than per lookup
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - ttl,))
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response
+
+        Args:
+            key: The request hash
+
+        Returns:
+            The cached response data, or None on miss/expiry
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, usage, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[2] > self._ttl:
+            return None
+        return {"text": row[0].decode("utf-8"), "usage": json.loads(row[1])}
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response
+
+        Args:
+            key: The request hash
+            response: The response data to cache
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (
+                    key,
+                    response["text"].encode("utf-8"),
+                    _canonical_bytes(response["usage"]),
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+
+# Process-wide response cache, enabled via LLM_CACHE_ENABLED
+_CACHE = LLMCache()
+
+
+def _disk_cache_enabled() -> bool:
+    """Check whether the persistent response cache is enabled via the environment"""
+    return os.getenv("LLM_DISK_CACHE_ENABLED", "").lower() in ("1", "true", "yes")
+
+
+@functools.lru_cache(maxsize=1)
+def _disk_cache() -> DiskCache:
+    """Get the shared on-disk response cache, opened on first use"""
+    return DiskCache()
+
+# Semantic caches per model name, enabled via LLM_SEMANTIC_CACHE_ENABLED
+_SEMANTIC_CACHES: Dict[str, SemanticCache] = {}
+
+
+def _semantic_cache_enabled() -> bool:
+    """Check whether semantic response caching is enabled via the environment"""
+    return os.getenv("LLM_SEMANTIC_CACHE_ENABLED", "").lower() in ("1", "true", "yes")
+
+
+def _semantic_cache_for(model_name: str) -> SemanticCache:
+    """Get (or create) the semantic cache for a model
+
+    Args:
+        model_name: The model whose cache to fetch
+
+    Returns:
+        The model's SemanticCache
+    """
+    cache = _SEMANTIC_CACHES.get(model_name)
+    if cache is None:
+        cache = _SEMANTIC_CACHES[model_name] = SemanticCache()
+    return cache
+
+
+def _stable_prefix_order(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Hoist system messages to the front of the conversation
+
+    Providers cache prompt prefixes byte-for-byte, so keeping the static
+    system block first (rather than interleaved with dynamic turns) lets the
+    unchanged prefix hit the server-side cache on every call. Returns the
+    input unchanged when nothing is out of place, which is the common case.
+
+    Args:
+        messages: The conversation history
+
+    Returns:
+        The history with all system messages first, relative order preserved
+    """
+    seen_non_system = False
+    for message in messages:
+        if message["role"] == "system":
+            if seen_non_system:
+                break
+        else:
+            seen_non_system = True
+    else:
+        return messages
+
+    system_messages = [m for m in messages if m["role"] == "system"]
+    other_messages = [m for m in messages if m["role"] != "system"]
+    return system_messages + other_messages
+
+
+def _last_user_content(messages: List[Dict[str, str]]) -> str:
+    """Get the content of the most recent user message
+
+    Args:
+        messages: The conversation history
+
+    Returns:
+        The last user message content ("" if none)
+    """
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i]["role"] == "user":
+            return messages[i]["content"]
+    return ""
+
+
+@functools.lru_cache(maxsize=8)
+def _get_gemini_model(name: str):
+    """Get the shared SDK handle for a Gemini model name
+
+    genai.GenerativeModel carries config and auth state that is wasteful
+    to reconstruct, so one instance per model name is shared by every
+    caller in the process.
+
+    Args:
+        name: The Gemini model name
+
+    Returns:
+        The shared genai.GenerativeModel instance
+    """
+    _configure_gemini_once()
+    return genai.GenerativeModel(name)
+
+
+@functools.lru_cache(maxsize=1)
+def _token_encoder():
+    """Get the shared tiktoken encoder, or None when unavailable
+
+    Returns:
+        The cl100k_base encoding, or None if tiktoken isn't installed
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def _estimate_usage(prompt_text: str, completion_text: str) -> Dict[str, int]:
+    """Estimate token usage for providers that don't report it
+
+    Uses tiktoken's C-implemented batch encoder when available; otherwise
+    falls back to the standard chars/4 heuristic, which is O(1) instead of
+    scanning the whole text.
+
+    Args:
+        prompt_text: The prompt side of the exchange
+        completion_text: The model's response text
+
+    Returns:
+        A usage dictionary with prompt/completion/total token counts
+    """
+    encoder = _token_encoder()
+    if encoder is not None:
+        prompt_tokens, completion_tokens = (
+            len(ids) for ids in encoder.encode_ordinary_batch([prompt_text, completion_text])
+        )
+    else:
+        prompt_tokens = (len(prompt_text) + 3) >> 2
+        completion_tokens = (len(completion_text) + 3) >> 2
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+
+
+def _cache_enabled() -> bool:
+    """Check whether response caching is enabled via the environment"""
+    return os.getenv("LLM_CACHE_ENABLED", "").lower() in ("1", "true", "yes")
+
+
+def _canonical_bytes(obj: Any) -> bytes:
+    """Serialize an object to canonical sorted-key JSON bytes
+
+    orjson emits bytes directly from C, so the hot hashing paths skip both
+    pure-Python serialization and the str.encode round-trip; stdlib json
+    is the fallback when orjson isn't installed.
+
+    Args:
+        obj: The object to serialize
+
+    Returns:
+        The canonical JSON encoding
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True).encode("utf-8")
+
+
+def _cache_key(provider: str, model_name: str, messages: List[Dict[str, str]]) -> str:
+    """Compute the cache key for a request
+
+    Args:
+        provider: The model provider name
+        model_name: The model name
+        messages: The conversation sent to the model
+
+    Returns:
+        The SHA-256 hex digest of the canonicalized request
+    """
+    return hashlib.sha256(
+        _canonical_bytes({"provider": provider, "model": model_name, "messages": list(messages)})
+    ).hexdigest()
+
+
+# Shared read-only default, so responses without usage don't each allocate
+# their own zero dictionary
+_ZERO_USAGE = types.MappingProxyType({"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0})
 
 
 class ModelResponse:
     """Standardized response from any model"""
-    
+
+    __slots__ = ("text", "usage")
+
     def __init__(self, text: str, usage: Dict[str, int] = None):
         """Initialize a model response
-        
+
         Args:
             text: The response text
             usage: Token usage statistics
         """
         self.text = text
-        self.usage = usage or {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        self.usage = usage or _ZERO_USAGE
 
 
 class BaseModel(ABC):
     """Base class for all language models"""
     
     @abstractmethod
-    def generate_response(self, messages: List[Dict[str, str]]) -> ModelResponse:
-        """Generate a response from the model
-        
+    def generate_response(self, messages: List[Dict[str, str]], n: int = 1) -> Union[ModelResponse, List[ModelResponse]]:
+        """Generate one or more responses from the model
+
         Args:
             messages: The conversation history
-        
+            n: Number of candidate responses to request in a single call
+
         Returns:
-            A ModelResponse object
+            A ModelResponse object, or a list of them when n > 1
         """
         pass
     
@@ -86,79 +688,179 @@ class OpenAIModel(BaseModel):
             model_name: The name of the OpenAI model to use
         """
         self._model_name = model_name
-        
-        # List of supported models
-        self.supported_models = ["gpt-3.5-turbo", "gpt-4", "gpt-4-turbo"]
-        
+
         # Validate model name
-        if model_name not in self.supported_models:
-            raise ValueError(f"Model '{model_name}' is not supported. Supported models: {', '.join(self.supported_models)}")
+        if model_name not in _OPENAI_MODELS:
+            raise ValueError(f"Model '{model_name}' is not supported. Supported models: {_OPENAI_MODELS_TEXT}")
+
+        _maybe_prewarm()
     
-    def generate_response(self, messages: List[Dict[str, str]]) -> ModelResponse:
-        """Generate a response from the OpenAI model
-        
+    def generate_response(self, messages: List[Dict[str, str]], n: int = 1) -> Union[ModelResponse, List[ModelResponse]]:
+        """Generate one or more responses from the OpenAI model
+
+        Asking for n candidates in one call amortizes the prompt prefill
+        and saves (n-1) round-trips versus n sequential requests.
+
         Args:
             messages: The conversation history
-        
+            n: Number of candidate responses to request in a single call
+
         Returns:
-            A ModelResponse object
-        
+            A ModelResponse object, or a list of them when n > 1
+
         Raises:
             Exception: If there's an error communicating with the API
         """
+        client_index = None
         try:
             # For testing or when no API key is available
-            if openai_api_key == "sk-placeholder" or openai_api_key == "your_openai_api_key_here":
+            if _openai_key() in _PLACEHOLDER_KEYS:
                 # Return a mock response for testing
-                return ModelResponse(
-                    text="This is a mock response. Please set a valid OPENAI_API_KEY in the .env file to get actual AI responses.",
-                    usage={"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
-                )
-            
-            # Lazy initialization of the OpenAI client
-            global client
-            if client is None:
-                client = OpenAI(api_key=openai_api_key)
-                
+                mock_responses = [
+                    ModelResponse(
+                        text="This is a mock response. Please set a valid OPENAI_API_KEY in the .env file to get actual AI responses.",
+                        usage={"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
+                    )
+                    for _ in range(n)
+                ]
+                return mock_responses if n > 1 else mock_responses[0]
+
+            # Keep the static system prefix first and byte-identical across
+            # turns so the provider's prompt-prefix cache can hit
+            messages = _stable_prefix_order(messages)
+
+            # Serve identical repeated requests from the in-memory cache,
+            # then the persistent one (which survives process restarts).
+            # Caches hold a single response, so multi-candidate calls skip
+            # them entirely
+            cache_key = None
+            memory_cached = n == 1 and _cache_enabled()
+            disk_cache = _disk_cache() if n == 1 and _disk_cache_enabled() else None
+            if memory_cached or disk_cache is not None:
+                cache_key = _cache_key(self.provider, self._model_name, messages)
+            if memory_cached:
+                cached = _CACHE.get(cache_key)
+                if cached is not None:
+                    return ModelResponse(text=cached["text"], usage=cached["usage"])
+            if disk_cache is not None:
+                cached = disk_cache.get(cache_key)
+                if cached is not None:
+                    if memory_cached:
+                        _CACHE.put(cache_key, cached)
+                    return ModelResponse(text=cached["text"], usage=cached["usage"])
+
+            # One reverse scan over the history for both semantic cache uses
+            last_user_message = _last_user_content(messages)
+
+            # Fall back to similarity lookup for paraphrased prompts
+            semantic_cache = None
+            if n == 1 and _semantic_cache_enabled():
+                semantic_cache = _semantic_cache_for(self._model_name)
+                cached = semantic_cache.get(last_user_message)
+                if cached is not None:
+                    return ModelResponse(text=cached["text"], usage=cached["usage"])
+
+            # Take the next key from the round-robin pool
+            client_index, client = _client_pool().acquire()
+
             # Send the conversation to the API using the new client format
             response = client.chat.completions.create(
                 model=self._model_name,
-                messages=messages
+                messages=messages,
+                n=n
             )
-            
-            # Extract the response content
-            text = response.choices[0].message.content
-            
-            # Extract usage statistics
+
+            # Extract usage statistics (single attribute fetch, no hasattr)
             usage = None
-            if hasattr(response, "usage"):
+            usage_obj = getattr(response, "usage", None)
+            if usage_obj is not None:
                 usage = {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
+                    "prompt_tokens": usage_obj.prompt_tokens,
+                    "completion_tokens": usage_obj.completion_tokens,
+                    "total_tokens": usage_obj.total_tokens
                 }
-            
+
+            # Usage covers the whole call, so it rides on the first
+            # candidate only
+            if n > 1:
+                return [
+                    ModelResponse(text=choice.message.content, usage=usage if i == 0 else None)
+                    for i, choice in enumerate(response.choices)
+                ]
+
+            # Extract the response content
+            text = response.choices[0].message.content
+
+            if cache_key is not None:
+                entry = {"text": text, "usage": usage}
+                if memory_cached:
+                    _CACHE.put(cache_key, entry)
+                if disk_cache is not None:
+                    disk_cache.put(cache_key, entry)
+            if semantic_cache is not None:
+                semantic_cache.put(last_user_message, {"text": text, "usage": usage})
+
             return ModelResponse(text=text, usage=usage)
-        
-        except Exception as e:
-            error_str = str(e)
-            # Handle specific error cases with user-friendly messages
-            if "insufficient_quota" in error_str:
-                error_message = "Your OpenAI API key has exceeded its quota. Please check your billing details at https://platform.openai.com/account/billing or use a different API key."
-            else:
-                error_message = f"Error communicating with OpenAI: {error_str}"
-            
-            raise Exception(error_message)
-    
+
+        except RateLimitError as e:
+            # Rate-limited keys leave the rotation until their cooldown ends
+            if client_index is not None:
+                _client_pool().cool_down(client_index)
+            if getattr(e, "code", None) == "insufficient_quota":
+                raise Exception("Your OpenAI API key has exceeded its quota. Please check your billing details at https://platform.openai.com/account/billing or use a different API key.")
+            raise Exception(f"Error communicating with OpenAI: {e}")
+        except (AuthenticationError, APIError) as e:
+            raise Exception(f"Error communicating with OpenAI: {e}")
+
+    def generate_response_stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream a response from the OpenAI model as it is generated
+
+        Yields text deltas as the API produces them, so the first tokens
+        reach the interface while the rest are still being generated
+        instead of after the full completion. Streaming responses bypass
+        the response caches; the chat engine caches the assembled text.
+
+        Args:
+            messages: The conversation history
+
+        Yields:
+            Chunks of the response text
+
+        Raises:
+            Exception: If there's an error communicating with the API
+        """
+        if _openai_key() in _PLACEHOLDER_KEYS:
+            yield "This is a mock response. Please set a valid OPENAI_API_KEY in the .env file to get actual AI responses."
+            return
+
+        messages = _stable_prefix_order(messages)
+        client_index, client = _client_pool().acquire()
+
+        try:
+            stream = client.chat.completions.create(
+                model=self._model_name,
+                messages=list(messages),
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        except RateLimitError as e:
+            if client_index is not None:
+                _client_pool().cool_down(client_index)
+            raise Exception(f"Error communicating with OpenAI: {e}")
+        except (AuthenticationError, APIError) as e:
+            raise Exception(f"Error communicating with OpenAI: {e}")
+
     @property
     def name(self) -> str:
         """Get the model name
-        
+
         Returns:
             The model name
         """
         return self._model_name
-    
+
     @property
     def provider(self) -> str:
         """Get the model provider
@@ -169,6 +871,15 @@ class OpenAIModel(BaseModel):
         return "OpenAI"
 
 
+# Role → Gemini Content constructor; a dict dispatch replaces the per-
+# message if/elif chain, and unknown roles are simply skipped
+_ROLE_MAP = {
+    "system": lambda content: {"role": "user", "parts": [f"[System] {content}"]},
+    "user": lambda content: {"role": "user", "parts": [content]},
+    "assistant": lambda content: {"role": "model", "parts": [content]},
+}
+
+
 class GeminiModel(BaseModel):
     """Google's Gemini language model"""
     
@@ -179,84 +890,301 @@ class GeminiModel(BaseModel):
             model_name: The name of the Gemini model to use
         """
         self._model_name = model_name
-        
-        # List of supported models
-        self.supported_models = ["gemini-pro", "gemini-pro-vision", "gemini-1.5-flash"]
-        
+
         # Validate model name
-        if model_name not in self.supported_models:
-            raise ValueError(f"Model '{model_name}' is not supported. Supported models: {', '.join(self.supported_models)}")
-    
-    def generate_response(self, messages: List[Dict[str, str]]) -> ModelResponse:
-        """Generate a response from the Gemini model
-        
+        if model_name not in _GEMINI_MODELS:
+            raise ValueError(f"Model '{model_name}' is not supported. Supported models: {_GEMINI_MODELS_TEXT}")
+
+        _maybe_prewarm()
+
+        # Warm the shared SDK handle so the first real call pays nothing
+        self._model = _get_gemini_model(model_name) if _gemini_key() else None
+
+        # Persistent chat sessions keyed by session id, so the server-side
+        # KV state is reused and only the newest turn is sent per call.
+        # ChatSession is not thread-safe, so session access is serialized
+        self._chat_sessions = OrderedDict()
+        self._sessions_lock = threading.Lock()
+
+    # Maximum number of concurrently tracked chat sessions
+    _MAX_SESSIONS = 8
+
+    @staticmethod
+    def _to_contents(messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Map chat messages into Gemini's Content schema
+
+        System turns become user turns with a [System] prefix; assistant
+        turns become model turns.
+
         Args:
             messages: The conversation history
-        
+
         Returns:
-            A ModelResponse object
-        
+            The contents list for the Gemini API
+        """
+        return [
+            _ROLE_MAP[message["role"]](message["content"])
+            for message in messages
+            if message["role"] in _ROLE_MAP
+        ]
+
+    @staticmethod
+    def _prefix_key(messages) -> str:
+        """Hash a message sequence for session-divergence detection"""
+        return hashlib.sha256(_canonical_bytes(list(messages))).hexdigest()
+
+    def _resolve_model(self):
+        """Get the SDK model handle, building it if the key arrived late
+
+        Construction caches None when no key is configured; if the key is
+        set afterwards (rotation, patched environment), the shared handle
+        is resolved on first use instead of failing on None.
+
+        Returns:
+            The shared genai.GenerativeModel instance
+        """
+        if self._model is None:
+            self._model = _get_gemini_model(self._model_name)
+        return self._model
+
+    def _session_for(self, session_id: str, messages, contents):
+        """Get the live session for a conversation, rebuilding on divergence
+
+        If the incoming history no longer matches what the session has
+        seen (cleared, loaded, or window-trimmed), the session is rebuilt
+        from scratch. Must be called holding self._sessions_lock.
+
+        Args:
+            session_id: The key identifying the conversation
+            messages: The raw message history (last entry must be the user turn)
+            contents: The history mapped to Gemini's Content schema
+
+        Returns:
+            A ChatSession positioned at the conversation prefix
+        """
+        prefix_key = self._prefix_key(messages[:-1])
+        entry = self._chat_sessions.get(session_id)
+
+        if entry is not None and entry[1] == prefix_key:
+            return entry[0]
+        return self._resolve_model().start_chat(history=contents[:-1])
+
+    def _store_session(self, session_id: str, session, messages, text: str) -> None:
+        """Remember what the session will have seen next turn
+
+        The stored key covers this history plus the assistant reply the
+        engine appends. Must be called holding self._sessions_lock.
+
+        Args:
+            session_id: The key identifying the conversation
+            session: The ChatSession that produced the reply
+            messages: The raw message history that was sent
+            text: The assistant reply
+        """
+        next_key = self._prefix_key(list(messages) + [{"role": "assistant", "content": text}])
+        self._chat_sessions[session_id] = (session, next_key)
+        self._chat_sessions.move_to_end(session_id)
+        if len(self._chat_sessions) > self._MAX_SESSIONS:
+            self._chat_sessions.popitem(last=False)
+
+    def _send_via_session(self, session_id: str, messages, contents) -> str:
+        """Send only the newest user turn over a persistent ChatSession
+
+        The session carries the conversation server-side, so the provider
+        does not re-prefill the whole history each turn.
+
+        Args:
+            session_id: The key identifying the conversation
+            messages: The raw message history (last entry must be the user turn)
+            contents: The history mapped to Gemini's Content schema
+
+        Returns:
+            The response text
+        """
+        # The lock covers the whole exchange: ChatSession mutates its
+        # internal history on send, so concurrent callers sharing a
+        # session id must be serialized, not just the table updates
+        with self._sessions_lock:
+            session = self._session_for(session_id, messages, contents)
+            response = session.send_message(contents[-1]["parts"][0])
+            text = response.text
+            self._store_session(session_id, session, messages, text)
+
+        return text
+
+    def _stream_via_session(self, session_id: str, messages, contents) -> Iterator[str]:
+        """Stream only the newest user turn over a persistent ChatSession
+
+        Same server-side reuse as _send_via_session, but chunks are
+        yielded as they arrive; the session table is updated once the
+        stream completes.
+
+        Args:
+            session_id: The key identifying the conversation
+            messages: The raw message history (last entry must be the user turn)
+            contents: The history mapped to Gemini's Content schema
+
+        Yields:
+            Chunks of the response text
+        """
+        with self._sessions_lock:
+            session = self._session_for(session_id, messages, contents)
+
+            chunks = []
+            for chunk in session.send_message(contents[-1]["parts"][0], stream=True):
+                chunks.append(chunk.text)
+                yield chunk.text
+
+            self._store_session(session_id, session, messages, "".join(chunks))
+
+    def generate_response(self, messages: List[Dict[str, str]], n: int = 1, *, session_id: Optional[str] = "default") -> Union[ModelResponse, List[ModelResponse]]:
+        """Generate one or more responses from the Gemini model
+
+        The positional parameters match BaseModel.generate_response, so
+        session_id is keyword-only and a positional n cannot be mistaken
+        for it.
+
+        Args:
+            messages: The conversation history
+            n: Number of candidate responses to request in a single call
+            session_id: Key for persistent chat-session reuse; pass None to
+                force a stateless single-shot request
+
+        Returns:
+            A ModelResponse object, or a list of them when n > 1
+
         Raises:
             Exception: If there's an error communicating with the API
         """
         try:
-            if not gemini_api_key:
-                return ModelResponse(
-                    text="Please set a valid GEMINI_API_KEY in the .env file to use Gemini models.",
-                    usage={"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
+            if not _gemini_key():
+                mock_responses = [
+                    ModelResponse(
+                        text="Please set a valid GEMINI_API_KEY in the .env file to use Gemini models.",
+                        usage={"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
+                    )
+                    for _ in range(n)
+                ]
+                return mock_responses if n > 1 else mock_responses[0]
+
+            # Serve identical repeated requests from the in-memory cache,
+            # then the persistent one (which survives process restarts).
+            # Caches hold a single response, so multi-candidate calls skip
+            # them entirely
+            cache_key = None
+            memory_cached = n == 1 and _cache_enabled()
+            disk_cache = _disk_cache() if n == 1 and _disk_cache_enabled() else None
+            if memory_cached or disk_cache is not None:
+                cache_key = _cache_key(self.provider, self._model_name, messages)
+            if memory_cached:
+                cached = _CACHE.get(cache_key)
+                if cached is not None:
+                    return ModelResponse(text=cached["text"], usage=cached["usage"])
+            if disk_cache is not None:
+                cached = disk_cache.get(cache_key)
+                if cached is not None:
+                    if memory_cached:
+                        _CACHE.put(cache_key, cached)
+                    return ModelResponse(text=cached["text"], usage=cached["usage"])
+
+            # One reverse scan over the history, shared by the semantic
+            # cache and the usage estimate below
+            last_user_message = _last_user_content(messages)
+
+            # Fall back to similarity lookup for paraphrased prompts
+            semantic_cache = None
+            if n == 1 and _semantic_cache_enabled():
+                semantic_cache = _semantic_cache_for(self._model_name)
+                cached = semantic_cache.get(last_user_message)
+                if cached is not None:
+                    return ModelResponse(text=cached["text"], usage=cached["usage"])
+
+            # Map the whole history into Gemini's Content schema; a single
+            # request replaces the old per-message round-trip loop
+            contents = self._to_contents(messages)
+
+            if not any(message["role"] == "user" for message in messages):
+                raise Exception("No user messages found in conversation history")
+
+            if n > 1:
+                # Candidates come from one stateless call; session reuse
+                # only applies to single-response turns
+                response = self._resolve_model().generate_content(
+                    contents,
+                    generation_config=genai.GenerationConfig(candidate_count=n)
                 )
-            
-            # Initialize Gemini model and chat
-            model = genai.GenerativeModel(self._model_name)
-            chat = model.start_chat()
-            
-            # Process all messages in the conversation history
-            for message in messages:
-                role = message["role"]
-                content = message["content"]
-                
-                if role == "system":
-                    # Add system message as a user message with [System] prefix
-                    chat.send_message(f"[System] {content}")
-                elif role == "user":
-                    chat.send_message(content)
-                elif role == "assistant":
-                    # Skip assistant messages as they're already in the history
-                    continue
-            
-            # Get the response from the last message
-            response = chat.last
-            if not response:
-                # If no response in history, send the last user message again
-                last_user_message = next((msg["content"] for msg in reversed(messages) if msg["role"] == "user"), None)
-                if last_user_message:
-                    response = chat.send_message(last_user_message)
-                else:
-                    raise Exception("No user messages found in conversation history")
-            
-            # Extract response text
-            text = response.text
+                responses = []
+                for candidate in response.candidates:
+                    candidate_text = "".join(part.text for part in candidate.content.parts)
+                    responses.append(ModelResponse(
+                        text=candidate_text,
+                        usage=_estimate_usage(last_user_message, candidate_text)
+                    ))
+                return responses
+
+            if session_id is not None and contents[-1]["role"] == "user":
+                # Reuse the persistent session so only the new turn is sent
+                text = self._send_via_session(session_id, messages, contents)
+            else:
+                response = self._resolve_model().generate_content(contents)
+                text = response.text
             
             # Gemini doesn't provide token usage, so we'll estimate
-            last_user_message = next((msg["content"] for msg in reversed(messages) if msg["role"] == "user"), "")
-            usage = {
-                "prompt_tokens": len(last_user_message.split()),
-                "completion_tokens": len(text.split()),
-                "total_tokens": len(last_user_message.split()) + len(text.split())
-            }
-            
+            usage = _estimate_usage(last_user_message, text)
+
+            if cache_key is not None:
+                entry = {"text": text, "usage": usage}
+                if memory_cached:
+                    _CACHE.put(cache_key, entry)
+                if disk_cache is not None:
+                    disk_cache.put(cache_key, entry)
+            if semantic_cache is not None:
+                semantic_cache.put(last_user_message, {"text": text, "usage": usage})
+
             return ModelResponse(text=text, usage=usage)
-            
-        except Exception as e:
-            error_str = str(e)
-            if "invalid_api_key" in error_str.lower():
-                error_message = "Invalid Gemini API key. Please check your GEMINI_API_KEY in the .env file."
-            elif "quota_exceeded" in error_str.lower():
-                error_message = "Your Gemini API key has exceeded its quota. Please check your quota limits or use a different API key."
+
+        except google_exceptions.Unauthenticated:
+            raise Exception("Invalid Gemini API key. Please check your GEMINI_API_KEY in the .env file.")
+        except google_exceptions.ResourceExhausted:
+            raise Exception("Your Gemini API key has exceeded its quota. Please check your quota limits or use a different API key.")
+        except google_exceptions.GoogleAPIError as e:
+            raise Exception(f"Error communicating with Gemini: {e}")
+
+    def generate_response_stream(self, messages: List[Dict[str, str]], *, session_id: Optional[str] = "default") -> Iterator[str]:
+        """Stream a response from the Gemini model as it is generated
+
+        Streams through the persistent chat session where possible, so
+        incremental rendering and server-side history reuse compose; the
+        chat engine reassembles and caches the full text.
+
+        Args:
+            messages: The conversation history
+            session_id: Key for persistent chat-session reuse; pass None to
+                force a stateless single-shot request
+
+        Yields:
+            Chunks of the response text
+
+        Raises:
+            Exception: If there's an error communicating with the API
+        """
+        if not _gemini_key():
+            yield "Please set a valid GEMINI_API_KEY in the .env file to use Gemini models."
+            return
+
+        contents = self._to_contents(messages)
+
+        try:
+            if session_id is not None and contents and contents[-1]["role"] == "user":
+                yield from self._stream_via_session(session_id, messages, contents)
             else:
-                error_message = f"Error communicating with Gemini: {error_str}"
-            raise Exception(error_message)
-    
+                for chunk in self._resolve_model().generate_content(contents, stream=True):
+                    yield chunk.text
+        except google_exceptions.ResourceExhausted:
+            raise Exception("Your Gemini API key has exceeded its quota. Please check your quota limits or use a different API key.")
+        except google_exceptions.GoogleAPIError as e:
+            raise Exception(f"Error communicating with Gemini: {e}")
+
     @property
     def name(self) -> str:
         """Get the model name
@@ -276,6 +1204,172 @@ class GeminiModel(BaseModel):
         return "Google"
 
 
+class AsyncOpenAIModel:
+    """Asynchronous OpenAI model for concurrent batch workloads
+
+    Mirrors OpenAIModel but awaits the API call, so many requests can be
+    in flight at once instead of paying one round-trip at a time.
+    """
+
+    def __init__(self, model_name: str = "gpt-3.5-turbo"):
+        """Initialize an async OpenAI model
+
+        Args:
+            model_name: The name of the OpenAI model to use
+        """
+        self._model_name = model_name
+        self._client = None
+
+        if model_name not in _OPENAI_MODELS:
+            raise ValueError(f"Model '{model_name}' is not supported. Supported models: {_OPENAI_MODELS_TEXT}")
+
+        _maybe_prewarm()
+
+    async def generate_response(self, messages: List[Dict[str, str]]) -> ModelResponse:
+        """Generate a response from the OpenAI model without blocking
+
+        Args:
+            messages: The conversation history
+
+        Returns:
+            A ModelResponse object
+        """
+        if _openai_key() in _PLACEHOLDER_KEYS:
+            return ModelResponse(
+                text="This is a mock response. Please set a valid OPENAI_API_KEY in the .env file to get actual AI responses.",
+                usage={"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
+            )
+
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=_openai_key(), http_client=_async_http_client())
+
+        response = await self._client.chat.completions.create(
+            model=self._model_name,
+            messages=list(messages)
+        )
+
+        text = response.choices[0].message.content
+        usage = None
+        usage_obj = getattr(response, "usage", None)
+        if usage_obj is not None:
+            usage = {
+                "prompt_tokens": usage_obj.prompt_tokens,
+                "completion_tokens": usage_obj.completion_tokens,
+                "total_tokens": usage_obj.total_tokens
+            }
+
+        return ModelResponse(text=text, usage=usage)
+
+
+class AsyncGeminiModel:
+    """Asynchronous Gemini model for concurrent batch workloads"""
+
+    def __init__(self, model_name: str = "gemini-pro"):
+        """Initialize an async Gemini model
+
+        Args:
+            model_name: The name of the Gemini model to use
+        """
+        self._model_name = model_name
+
+        if model_name not in _GEMINI_MODELS:
+            raise ValueError(f"Model '{model_name}' is not supported. Supported models: {_GEMINI_MODELS_TEXT}")
+
+        _maybe_prewarm()
+
+        self._model = _get_gemini_model(model_name) if _gemini_key() else None
+
+    def _resolve_model(self):
+        """Get the SDK model handle, building it if the key arrived late
+
+        Mirrors GeminiModel._resolve_model: construction caches None when
+        no key is configured, so the handle is resolved on first use.
+
+        Returns:
+            The shared genai.GenerativeModel instance
+        """
+        if self._model is None:
+            self._model = _get_gemini_model(self._model_name)
+        return self._model
+
+    async def generate_response(self, messages: List[Dict[str, str]]) -> ModelResponse:
+        """Generate a response from the Gemini model without blocking
+
+        Args:
+            messages: The conversation history
+
+        Returns:
+            A ModelResponse object
+        """
+        if not _gemini_key():
+            return ModelResponse(
+                text="Please set a valid GEMINI_API_KEY in the .env file to use Gemini models.",
+                usage={"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
+            )
+
+        contents = GeminiModel._to_contents(messages)
+        response = await self._resolve_model().generate_content_async(contents)
+        text = response.text
+
+        return ModelResponse(text=text, usage=_estimate_usage(_last_user_content(messages), text))
+
+
+class BatchProcessor:
+    """Dispatch many model requests concurrently within provider limits
+
+    Concurrency is bounded by a semaphore and request starts are spaced by
+    a token-bucket style limiter, so throughput scales with max_concurrency
+    without tripping 429s.
+    """
+
+    def __init__(self, model, max_concurrency: int = 10, rate_limit_rpm: int = 300):
+        """Initialize the batch processor
+
+        Args:
+            model: An async model exposing `await generate_response(messages)`
+            max_concurrency: Maximum number of in-flight requests
+            rate_limit_rpm: Maximum request starts per minute
+        """
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.rate_limit_rpm = rate_limit_rpm
+
+    async def process(self, message_lists: List[List[Dict[str, str]]]) -> List[Any]:
+        """Run a batch of conversations concurrently
+
+        Args:
+            message_lists: One conversation history per request
+
+        Returns:
+            A list of ModelResponse objects (or exceptions) in input order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        interval = 60.0 / self.rate_limit_rpm
+        lock = asyncio.Lock()
+        next_slot = 0.0
+
+        async def throttle() -> None:
+            nonlocal next_slot
+            loop = asyncio.get_running_loop()
+            async with lock:
+                now = loop.time()
+                wait = next_slot - now
+                next_slot = (next_slot if wait > 0 else now) + interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        async def run_one(messages):
+            async with semaphore:
+                await throttle()
+                return await self.model.generate_response(messages)
+
+        return await asyncio.gather(
+            *(run_one(messages) for messages in message_lists),
+            return_exceptions=True,
+        )
+
+
 class ModelFactory:
     """Factory for creating language models"""
     
@@ -292,28 +1386,26 @@ class ModelFactory:
         Raises:
             ValueError: If the model is not supported
         """
-        # OpenAI models
-        openai_models = ["gpt-3.5-turbo", "gpt-4", "gpt-4-turbo"]
-        
-        # Gemini models
-        gemini_models = ["gemini-pro", "gemini-pro-vision", "gemini-1.5-flash"]
-        
-        if model_name in openai_models:
+        if model_name in _OPENAI_MODELS:
             return OpenAIModel(model_name=model_name)
-        elif model_name in gemini_models:
+        elif model_name in _GEMINI_MODELS:
             return GeminiModel(model_name=model_name)
         
         raise ValueError(f"Model '{model_name}' is not supported")
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_supported_models() -> Dict[str, List[str]]:
         """Get a list of supported models grouped by provider
-        
+
+        The result is memoized: provider enumeration is static, so repeated
+        calls (e.g. /models or failed /model commands) reuse one dictionary.
+
         Returns:
             A dictionary of supported models grouped by provider
         """
         return {
-            "OpenAI": ["gpt-3.5-turbo", "gpt-4", "gpt-4-turbo"],
-            "Google": ["gemini-pro", "gemini-pro-vision", "gemini-1.5-flash"],
+            "OpenAI": sorted(_OPENAI_MODELS),
+            "Google": sorted(_GEMINI_MODELS),
             # Add other providers here
         }
\ No newline at end of file
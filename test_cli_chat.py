@@ -5,6 +5,10 @@ Test suite for CLI Chat Tool
 
 import os
 import sys
+import json
+import time
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -15,7 +19,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from chat_engine import ChatEngine
 from cli_interface import CLIInterface
 from config import Config
-from ml_models import ModelFactory, OpenAIModel, BaseModel, ModelResponse
+from conversation import ConversationManager
+from ml_models import (
+    ModelFactory,
+    OpenAIModel,
+    GeminiModel,
+    BaseModel,
+    ModelResponse,
+    LLMCache,
+    DiskCache,
+    _ClientPool,
+)
 
 
 class TestChatEngine(unittest.TestCase):
@@ -99,6 +113,240 @@ class TestChatEngine(unittest.TestCase):
         self.assertEqual(usage["total_tokens"], 15)
 
 
+class TestChatEngineCache(unittest.TestCase):
+    """Test the prefix-hash response cache in ChatEngine"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.engine = ChatEngine()
+        self.engine.model = MagicMock()
+        self.engine.model.generate_response.return_value = ModelResponse(
+            text="Test response",
+            usage={"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+        )
+
+    def test_cache_hit_on_repeated_prefix(self):
+        """Test that an identical conversation prefix is served from cache"""
+        self.engine.send_message("Hello")
+        self.engine.clear_history()
+        response = self.engine.send_message("Hello")
+
+        # The second send must not reach the model
+        self.assertEqual(response, "Test response")
+        self.assertEqual(self.engine.model.generate_response.call_count, 1)
+        info = self.engine.get_cache_info()
+        self.assertEqual(info["hits"], 1)
+        self.assertEqual(info["misses"], 1)
+
+    def test_cache_miss_after_system_message_change(self):
+        """Test that changing the system message invalidates the prefix"""
+        self.engine.send_message("Hello")
+        self.engine.clear_history()
+        self.engine.set_system_message("Different context")
+        self.engine.send_message("Hello")
+
+        self.assertEqual(self.engine.model.generate_response.call_count, 2)
+        self.assertEqual(self.engine.get_cache_info()["hits"], 0)
+
+    def test_history_windowing(self):
+        """Test that only the last N turns are sent to the model"""
+        engine = ChatEngine(system_message="You are helpful")
+        engine.model = self.engine.model
+        engine.set_max_turns(1)
+
+        for i in range(4):
+            engine.send_message(f"Message {i}")
+
+        # system message + one prior turn + the new user message
+        payload = engine.model.generate_response.call_args[0][0]
+        self.assertEqual(len(payload), 4)
+        self.assertEqual(payload[0]["role"], "system")
+        self.assertEqual(payload[-1]["content"], "Message 3")
+
+        # The full history is still retained locally
+        self.assertEqual(len(engine.get_conversation_history()), 9)
+
+    def test_failed_send_leaves_history_unchanged(self):
+        """Test that a failed model call does not commit the turn"""
+        self.engine.send_message("Hello")
+        before = list(self.engine.get_conversation_history())
+
+        self.engine.model.generate_response.side_effect = Exception("API down")
+        with self.assertRaises(Exception):
+            self.engine.send_message("Another message")
+
+        self.assertEqual(self.engine.get_conversation_history(), before)
+
+
+class TestConversationPersistence(unittest.TestCase):
+    """Test saving and loading conversations"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.engine = ChatEngine()
+        self.engine.model = MagicMock()
+        self.engine.model.name = "gpt-3.5-turbo"
+        self.engine.model.provider = "OpenAI"
+        self.engine.model.generate_response.return_value = ModelResponse(
+            text="Test response",
+            usage={"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+        )
+
+    def tearDown(self):
+        """Clean up test environment"""
+        # clear_history also closes the autosave log handle
+        self.engine.clear_history()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make_manager(self, engine):
+        """Build a ConversationManager rooted in the temp directory"""
+        manager = ConversationManager(engine, MagicMock())
+        manager.conversation_dir = self.tmpdir
+        return manager
+
+    def test_jsonl_roundtrip(self):
+        """Test saving and reloading the .jsonl + .meta.json format"""
+        self.engine.send_message("Hello")
+        saved_history = list(self.engine.get_conversation_history())
+
+        filepath = self.engine.save_conversation(os.path.join(self.tmpdir, "conv"))
+        self.assertTrue(filepath.endswith(".jsonl"))
+        self.assertTrue(os.path.exists(filepath[:-len(".jsonl")] + ".meta.json"))
+
+        engine2 = ChatEngine()
+        engine2.model = MagicMock()
+        manager = self._make_manager(engine2)
+        self.assertTrue(manager.load_conversation(filepath))
+        self.assertEqual(engine2.get_conversation_history(), saved_history)
+
+    def test_legacy_json_load(self):
+        """Test loading the legacy single-document .json format"""
+        conversation = [
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Hi there"},
+        ]
+        legacy = {
+            "timestamp": "2024-01-01T00:00:00",
+            "model": "gpt-3.5-turbo",
+            "provider": "OpenAI",
+            "conversation": conversation,
+            "token_usage": {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3},
+        }
+        filepath = os.path.join(self.tmpdir, "legacy.json")
+        with open(filepath, "w") as f:
+            json.dump(legacy, f)
+
+        engine2 = ChatEngine()
+        engine2.model = MagicMock()
+        manager = self._make_manager(engine2)
+        self.assertTrue(manager.load_conversation(filepath))
+        self.assertEqual(engine2.get_conversation_history(), conversation)
+        self.assertEqual(engine2.get_token_usage()["total_tokens"], 3)
+
+
+class TestLLMCache(unittest.TestCase):
+    """Test the exact-match response cache"""
+
+    def test_hit_and_ttl_expiry(self):
+        """Test that entries are returned until their TTL passes"""
+        cache = LLMCache(max_entries=4, ttl=0.05)
+        cache.put("key", {"text": "value", "usage": None})
+
+        self.assertEqual(cache.get("key")["text"], "value")
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("key"))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full"""
+        cache = LLMCache(max_entries=2, ttl=60.0)
+        cache.put("a", {"text": "a", "usage": None})
+        cache.put("b", {"text": "b", "usage": None})
+        cache.get("a")  # refresh "a" so "b" is the eviction candidate
+        cache.put("c", {"text": "c", "usage": None})
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+
+class TestDiskCache(unittest.TestCase):
+    """Test the persistent SQLite response cache"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "cache.sqlite")
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_roundtrip_across_instances(self):
+        """Test that entries survive reopening the database"""
+        entry = {"text": "value", "usage": {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3}}
+        DiskCache(path=self.path).put("key", entry)
+
+        reopened = DiskCache(path=self.path)
+        self.assertEqual(reopened.get("key"), entry)
+        self.assertIsNone(reopened.get("missing"))
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are not returned"""
+        cache = DiskCache(path=self.path, ttl=0.05)
+        cache.put("key", {"text": "value", "usage": None})
+
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("key"))
+
+
+class TestClientPool(unittest.TestCase):
+    """Test the round-robin OpenAI client pool"""
+
+    def test_round_robin_and_cooldown(self):
+        """Test that keys rotate and cooled-down keys are skipped"""
+        pool = _ClientPool(["key-a", "key-b"])
+        first, _ = pool.acquire()
+        second, _ = pool.acquire()
+        self.assertNotEqual(first, second)
+
+        pool.cool_down(first, seconds=60.0)
+        for _ in range(4):
+            index, _ = pool.acquire()
+            self.assertEqual(index, second)
+
+
+class TestGeminiSessions(unittest.TestCase):
+    """Test persistent chat-session reuse in GeminiModel"""
+
+    @patch.dict(os.environ, {"GEMINI_API_KEY": ""})
+    def test_session_reuse_and_divergence(self):
+        """Test that matching histories reuse the session and diverged ones rebuild it"""
+        model = GeminiModel()
+        model._model = MagicMock()
+        session = MagicMock()
+        session.send_message.return_value = MagicMock(text="Reply")
+        model._model.start_chat.return_value = session
+
+        messages = [{"role": "user", "content": "First"}]
+        text = model._send_via_session("default", messages, GeminiModel._to_contents(messages))
+        self.assertEqual(text, "Reply")
+        self.assertEqual(model._model.start_chat.call_count, 1)
+
+        # The committed history plus the reply matches the stored key
+        followup = messages + [
+            {"role": "assistant", "content": text},
+            {"role": "user", "content": "Second"},
+        ]
+        model._send_via_session("default", followup, GeminiModel._to_contents(followup))
+        self.assertEqual(model._model.start_chat.call_count, 1)
+
+        # A cleared or rewritten history must rebuild the session
+        diverged = [{"role": "user", "content": "Something else"}]
+        model._send_via_session("default", diverged, GeminiModel._to_contents(diverged))
+        self.assertEqual(model._model.start_chat.call_count, 2)
+
+
 class TestCLIInterface(unittest.TestCase):
     """Test the CLIInterface class"""
 